@@ -1,6 +1,3 @@
-# Import the AgentRearrange class for coordinating multiple agents
-from swarms import AgentRearrange
-
 # Import specialized medical agents for different aspects of patient care
 from multi_agent_rag.agents import (
     diagnostic_specialist,  # Agent for diagnostic analysis
@@ -13,16 +10,24 @@ from multi_agent_rag.agents import (
 # Import database class for storing and retrieving medical documents
 from multi_agent_rag.memory import LlamaIndexDB
 
+# Import the AgentRearrange variant that runs independent agents concurrently
+from multi_agent_rag.router import ParallelAgentRearrange
+
+# Import the semantic cache that answers near-duplicate tasks without the agents
+from multi_agent_rag.semantic_cache import CachedRouter, SemanticCache
+
 # Initialize the SwarmRouter to coordinate the medical agents
-router = AgentRearrange(
+router = ParallelAgentRearrange(
     name="medical-diagnosis-treatment-swarm",
     description="Collaborative medical team for comprehensive patient diagnosis and treatment planning",
     max_loops=1,  # Limit to one iteration through the agent flow
+    max_parallel_agents=2,  # Run the two post-diagnosis agents at once
+    agent_timeout=300,  # Give up on an agent after five minutes
     agents=[
         medical_data_extractor,  # First agent to extract medical data
         diagnostic_specialist,  # Second agent to analyze and diagnose
-        treatment_planner,  # Third agent to plan treatment
-        specialist_consultant,  # Fourth agent to provide specialist input
+        treatment_planner,  # Plans treatment in parallel with the specialist
+        specialist_consultant,  # Provides specialist input in parallel
         patient_care_coordinator,  # Final agent to coordinate care plan
     ],
     # Configure the document storage and retrieval system
@@ -33,13 +38,25 @@ router = AgentRearrange(
         # required_exts=[".txt", ".pdf", ".docx"],  # Supported file types
         similarity_top_k=10,  # Return top 10 most relevant documents
     ),
-    # Define the sequential flow of information between agents
-    flow=f"{medical_data_extractor.agent_name} -> {diagnostic_specialist.agent_name} -> {treatment_planner.agent_name} -> {specialist_consultant.agent_name} -> {patient_care_coordinator.agent_name}",
+    # Define the flow of information between agents; comma-separated agents
+    # only need the diagnosis and run concurrently
+    flow=f"{medical_data_extractor.agent_name} -> {diagnostic_specialist.agent_name} -> {treatment_planner.agent_name}, {specialist_consultant.agent_name} -> {patient_care_coordinator.agent_name}",
+)
+
+# Serve near-duplicate tasks from a semantic cache instead of rerunning the swarm
+cached_router = CachedRouter(
+    router,
+    cache=SemanticCache(
+        similarity_threshold=0.92,  # Minimum cosine similarity for a cache hit
+        ttl=3600,  # Expire cached answers after one hour
+        index_path="semantic_cache.faiss",  # Persist the cache across runs
+    ),
 )
 
 # Example usage
 if __name__ == "__main__":
     # Run a comprehensive medical analysis task for patient Lucas Brown
-    router.run(
-        "Analyze this Lucas Brown's medical data to provide a diagnosis and treatment plan"
+    cached_router.run(
+        "Analyze this Lucas Brown's medical data to provide a diagnosis and treatment plan",
+        cache_key="Lucas Brown",  # Only reuse answers given for the same patient
     )
@@ -1,41 +1,205 @@
+import asyncio
+import atexit
 import os
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import openai
+import orjson
 from dotenv import load_dotenv
+from loguru import logger
 from swarms import Agent
 from swarm_models import OpenAIChat
 
 load_dotenv()
 
+# Single background writer so saving agent state never blocks an agent loop
+state_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-state")
+atexit.register(state_writer.shutdown)
+
+
+def _write_state(path: Path, data: bytes) -> None:
+    """Atomically write serialized agent state to disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".temp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def _log_save_error(future: Future) -> None:
+    """Log a failed background save as soon as it happens."""
+    if future.exception() is not None:
+        logger.error(f"Failed to save agent state: {future.exception()!r}")
+
+
+class BackgroundStateAgent(Agent):
+    """An Agent that serializes its state with orjson and saves it on a background thread.
+
+    The state is the same dict ``Agent.to_json`` serializes, written to the
+    path the pinned swarms release's ``Agent.save`` uses: ``saved_state_path``
+    inside the agent's own workspace directory. ``Agent.load`` resolves its
+    default path differently, so pass it the saved file's path explicitly.
+    A failed write is logged when it happens and raised by the next save.
+    """
+
+    def _state_path(self, file_path: Optional[str] = None) -> Path:
+        """Resolve the state file the way Agent.save does."""
+        resolved_path = (
+            file_path or self.saved_state_path or f"{self.agent_name}_state.json"
+        )
+        if not resolved_path.endswith(".json"):
+            resolved_path += ".json"
+        # Absolute paths are kept as is by the join
+        return Path(self._get_agent_workspace_dir()) / resolved_path
+
+    def save_state(self, file_path: Optional[str] = None, *args, **kwargs) -> None:
+        """Serialize the agent state and queue it for writing.
+
+        Raises:
+            Exception: The error of the previous save, if it failed
+        """
+        previous = getattr(self, "_pending_save", None)
+        if previous is not None and previous.done() and previous.exception():
+            self._pending_save = None
+            raise previous.exception()
+
+        state = self.to_dict()
+        state.pop("_pending_save", None)
+        data = orjson.dumps(
+            state,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        self._pending_save = state_writer.submit(
+            _write_state, self._state_path(file_path), data
+        )
+        self._pending_save.add_done_callback(_log_save_error)
+
+    def save(self, file_path: Optional[str] = None, *args, **kwargs) -> None:
+        """Autosave hook, routed through save_state."""
+        self.save_state(file_path)
+
+
 # Get the OpenAI API key from the environment variable
 api_key = os.getenv("GROQ_API_KEY")
+base_url = "https://api.groq.com/openai/v1"
+
+# Shared HTTP/2 connection pool so every agent call reuses the same TCP+TLS
+# connections instead of opening new ones. The sync OpenAI client is built
+# here and handed to the models instead of letting OpenAIChat create one.
+http_limits = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+http_client = httpx.Client(http2=True, limits=http_limits)
+atexit.register(http_client.close)
+
+openai_client = openai.OpenAI(
+    base_url=base_url, api_key=api_key, http_client=http_client
+)
+
+
+class _LoopLocalAsyncCompletions:
+    """Async chat completions backed by one pooled AsyncOpenAI client per event loop.
+
+    The connections of an httpx.AsyncClient belong to the loop that opened
+    them, and the router and its callers each start their own loops, so a
+    single client shared across them fails with "Event loop is closed". A
+    client is created lazily for each running loop instead, and the clients of
+    loops that are still open are closed at exit.
+    """
+
+    def __init__(self) -> None:
+        # Keyed weakly so clients of finished loops are dropped with them
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _client(self) -> openai.AsyncOpenAI:
+        """Return the client of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = openai.AsyncOpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=httpx.AsyncClient(http2=True, limits=http_limits),
+                )
+                self._clients[loop] = client
+        return client
+
+    async def create(self, **kwargs) -> Any:
+        """Create a chat completion with the running loop's client."""
+        return await self._client().chat.completions.create(**kwargs)
+
+    def close(self) -> None:
+        """Close the clients whose event loops can still run them."""
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+
+        for loop, client in clients:
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.close())
+
+
+async_completions = _LoopLocalAsyncCompletions()
+atexit.register(async_completions.close)
 
 # Model
 model = OpenAIChat(
-    openai_api_base="https://api.groq.com/openai/v1",
+    openai_api_base=base_url,
     openai_api_key=api_key,
     model_name="llama-3.1-70b-versatile",
     temperature=0.1,
+    client=openai_client.chat.completions,
+    async_client=async_completions,
+)
+
+# Deterministic model for the structured-output stages (data extraction and
+# care coordination), so identical inputs give identical, cacheable outputs
+deterministic_model = OpenAIChat(
+    openai_api_base=base_url,
+    openai_api_key=api_key,
+    model_name="llama-3.1-70b-versatile",
+    temperature=0.0,
+    top_p=1.0,
+    client=openai_client.chat.completions,
+    async_client=async_completions,
 )
 
+# System prompts are kept as module-level constants so the agent
+# definitions below stay short and the prompts are easy to find and edit
+MEDICAL_DATA_EXTRACTOR_PROMPT = "You are a specialized medical data extraction expert, trained in processing and analyzing clinical data, lab results, medical imaging reports, and patient records. Your role is to carefully extract relevant medical information while maintaining strict HIPAA compliance and patient confidentiality. Focus on identifying key clinical indicators, test results, vital signs, medication histories, and relevant patient history. Pay special attention to temporal relationships between symptoms, treatments, and outcomes. Ensure all extracted data maintains proper medical context and terminology."
+
+DIAGNOSTIC_SPECIALIST_PROMPT = "You are a senior diagnostic physician with extensive experience in differential diagnosis. Your role is to analyze patient symptoms, lab results, and clinical findings to develop comprehensive diagnostic assessments. Consider all presenting symptoms, patient history, risk factors, and test results to formulate possible diagnoses. Prioritize diagnoses based on clinical probability and severity. Always consider both common and rare conditions that match the symptom pattern. Recommend additional tests or imaging when needed for diagnostic clarity. Follow evidence-based diagnostic criteria and current medical guidelines."
+
+TREATMENT_PLANNER_PROMPT = "You are an experienced clinical treatment specialist focused on developing comprehensive treatment plans. Your expertise covers both acute and chronic condition management, medication selection, and therapeutic interventions. Consider patient-specific factors including age, comorbidities, allergies, and contraindications when recommending treatments. Incorporate both pharmacological and non-pharmacological interventions. Emphasize evidence-based treatment protocols while considering patient preferences and quality of life. Address potential drug interactions and side effects. Include monitoring parameters and treatment milestones."
+
+SPECIALIST_CONSULTANT_PROMPT = "You are a medical specialist consultant with expertise across multiple disciplines including cardiology, neurology, endocrinology, and internal medicine. Your role is to provide specialized insight for complex cases requiring deep domain knowledge. Analyze cases from your specialist perspective, considering rare conditions and complex interactions between multiple systems. Provide detailed recommendations for specialized testing, imaging, or interventions within your domain. Highlight potential complications or considerations that may not be immediately apparent to general practitioners."
+
+PATIENT_CARE_COORDINATOR_PROMPT = "You are a patient care coordinator specializing in comprehensive healthcare management. Your role is to ensure holistic patient care by coordinating between different medical specialists, considering patient needs, and managing care transitions. Focus on patient education, medication adherence, lifestyle modifications, and follow-up care planning. Consider social determinants of health, patient resources, and access to care. Develop actionable care plans that patients can realistically follow. Coordinate with other healthcare providers to ensure continuity of care and proper implementation of treatment plans."
+
 
 # Initialize specialized medical agents
-medical_data_extractor = Agent(
+medical_data_extractor = BackgroundStateAgent(
     agent_name="Medical-Data-Extractor",
-    system_prompt="You are a specialized medical data extraction expert, trained in processing and analyzing clinical data, lab results, medical imaging reports, and patient records. Your role is to carefully extract relevant medical information while maintaining strict HIPAA compliance and patient confidentiality. Focus on identifying key clinical indicators, test results, vital signs, medication histories, and relevant patient history. Pay special attention to temporal relationships between symptoms, treatments, and outcomes. Ensure all extracted data maintains proper medical context and terminology.",
-    llm=model,
+    system_prompt=MEDICAL_DATA_EXTRACTOR_PROMPT,
+    llm=deterministic_model,
     max_loops=1,
     autosave=True,
     verbose=True,
-    dynamic_temperature_enabled=True,
     saved_state_path="medical_data_extractor.json",
     user_name="medical_team",
     retry_attempts=1,
-    context_length=200000,
+    context_length=128000,
     output_type="string",
 )
 
-diagnostic_specialist = Agent(
+diagnostic_specialist = BackgroundStateAgent(
     agent_name="Diagnostic-Specialist",
-    system_prompt="You are a senior diagnostic physician with extensive experience in differential diagnosis. Your role is to analyze patient symptoms, lab results, and clinical findings to develop comprehensive diagnostic assessments. Consider all presenting symptoms, patient history, risk factors, and test results to formulate possible diagnoses. Prioritize diagnoses based on clinical probability and severity. Always consider both common and rare conditions that match the symptom pattern. Recommend additional tests or imaging when needed for diagnostic clarity. Follow evidence-based diagnostic criteria and current medical guidelines.",
+    system_prompt=DIAGNOSTIC_SPECIALIST_PROMPT,
     llm=model,
     max_loops=1,
     autosave=True,
@@ -44,13 +208,13 @@ diagnostic_specialist = Agent(
     saved_state_path="diagnostic_specialist.json",
     user_name="medical_team",
     retry_attempts=1,
-    context_length=200000,
+    context_length=128000,
     output_type="string",
 )
 
-treatment_planner = Agent(
+treatment_planner = BackgroundStateAgent(
     agent_name="Treatment-Planner",
-    system_prompt="You are an experienced clinical treatment specialist focused on developing comprehensive treatment plans. Your expertise covers both acute and chronic condition management, medication selection, and therapeutic interventions. Consider patient-specific factors including age, comorbidities, allergies, and contraindications when recommending treatments. Incorporate both pharmacological and non-pharmacological interventions. Emphasize evidence-based treatment protocols while considering patient preferences and quality of life. Address potential drug interactions and side effects. Include monitoring parameters and treatment milestones.",
+    system_prompt=TREATMENT_PLANNER_PROMPT,
     llm=model,
     max_loops=1,
     autosave=True,
@@ -59,13 +223,13 @@ treatment_planner = Agent(
     saved_state_path="treatment_planner.json",
     user_name="medical_team",
     retry_attempts=1,
-    context_length=200000,
+    context_length=128000,
     output_type="string",
 )
 
-specialist_consultant = Agent(
+specialist_consultant = BackgroundStateAgent(
     agent_name="Specialist-Consultant",
-    system_prompt="You are a medical specialist consultant with expertise across multiple disciplines including cardiology, neurology, endocrinology, and internal medicine. Your role is to provide specialized insight for complex cases requiring deep domain knowledge. Analyze cases from your specialist perspective, considering rare conditions and complex interactions between multiple systems. Provide detailed recommendations for specialized testing, imaging, or interventions within your domain. Highlight potential complications or considerations that may not be immediately apparent to general practitioners.",
+    system_prompt=SPECIALIST_CONSULTANT_PROMPT,
     llm=model,
     max_loops=1,
     autosave=True,
@@ -74,21 +238,20 @@ specialist_consultant = Agent(
     saved_state_path="specialist_consultant.json",
     user_name="medical_team",
     retry_attempts=1,
-    context_length=200000,
+    context_length=128000,
     output_type="string",
 )
 
-patient_care_coordinator = Agent(
+patient_care_coordinator = BackgroundStateAgent(
     agent_name="Patient-Care-Coordinator",
-    system_prompt="You are a patient care coordinator specializing in comprehensive healthcare management. Your role is to ensure holistic patient care by coordinating between different medical specialists, considering patient needs, and managing care transitions. Focus on patient education, medication adherence, lifestyle modifications, and follow-up care planning. Consider social determinants of health, patient resources, and access to care. Develop actionable care plans that patients can realistically follow. Coordinate with other healthcare providers to ensure continuity of care and proper implementation of treatment plans.",
-    llm=model,
+    system_prompt=PATIENT_CARE_COORDINATOR_PROMPT,
+    llm=deterministic_model,
     max_loops=1,
     autosave=True,
     verbose=True,
-    dynamic_temperature_enabled=True,
     saved_state_path="patient_care_coordinator.json",
     user_name="medical_team",
     retry_attempts=1,
-    context_length=200000,
+    context_length=128000,
     output_type="string",
 )
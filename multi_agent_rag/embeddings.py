@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import Optional
+
+import torch
+from loguru import logger
+from sentence_transformers import SentenceTransformer
+
+
+def _default_device() -> str:
+    """The device SentenceTransformer picks when none is given."""
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def get_embedder(
+    model_name: str, device: Optional[str] = None, quantize: bool = True
+) -> SentenceTransformer:
+    """
+    Load a sentence-transformer model once per process.
+
+    Managers and caches created with the same model and device share a single
+    instance instead of each loading their own copy of the weights. On CPU the
+    Linear layers of the transformer are dynamically quantized to INT8, which
+    roughly doubles encoding throughput with negligible loss in retrieval
+    quality.
+
+    Args:
+        model_name: Name of the sentence-transformer model to load
+        device: Device to load the model on, None to pick one automatically
+        quantize: Whether to quantize the model to INT8 when running on CPU
+
+    Returns:
+        SentenceTransformer: The shared model instance
+    """
+    # lru_cache keys on the arguments as passed, so resolve the device and
+    # always pass keywords to give every call for the same model one key
+    return _load_embedder(
+        model_name=model_name, device=device or _default_device(), quantize=quantize
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_embedder(model_name: str, device: str, quantize: bool) -> SentenceTransformer:
+    """Load and optionally quantize a sentence-transformer model."""
+    logger.info(f"Loading embedding model: {model_name}")
+    embedder = SentenceTransformer(model_name, device=device)
+
+    # Dynamic quantization only has CPU kernels
+    if quantize and embedder.device.type == "cpu":
+        transformer = embedder[0]
+        transformer.auto_model = torch.ao.quantization.quantize_dynamic(
+            transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info(f"Quantized embedding model to INT8: {model_name}")
+
+    return embedder
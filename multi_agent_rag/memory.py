@@ -1,7 +1,8 @@
 from typing import Optional
 from pathlib import Path
 from loguru import logger
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader
+from llama_index.core import Settings, VectorStoreIndex, SimpleDirectoryReader
+from llama_index.core.embeddings.utils import resolve_embed_model
 
 
 class LlamaIndexDB:
@@ -11,6 +12,13 @@ class LlamaIndexDB:
 
     Args:
         data_dir (str): Directory containing documents to index. Defaults to "docs".
+        embed_batch_size (Optional[int]): Minimum number of text chunks embedded per model
+            call. The embed model's batch size is only ever raised to this value, on a copy
+            of the model. Defaults to None, which leaves the embed model as is.
+        num_workers (Optional[int]): Number of processes used to load and parse documents.
+            Worker processes re-import the calling script, so only set this when indexing
+            runs under an ``if __name__ == "__main__":`` guard. Defaults to None, which
+            loads documents in the current process.
         **kwargs: Additional arguments passed to SimpleDirectoryReader and VectorStoreIndex.
             SimpleDirectoryReader kwargs:
                 - filename_as_id (bool): Use filenames as document IDs
@@ -25,14 +33,23 @@ class LlamaIndexDB:
                 - store_nodes_override (bool): Override node storage
     """
 
-    def __init__(self, data_dir: str = "docs", **kwargs) -> None:
+    def __init__(
+        self,
+        data_dir: str = "docs",
+        embed_batch_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        **kwargs,
+    ) -> None:
         """Initialize the LlamaIndexDB with an empty index.
 
         Args:
             data_dir (str): Directory containing documents to index
+            embed_batch_size (Optional[int]): Minimum number of text chunks embedded per model call
+            num_workers (Optional[int]): Number of processes used to load documents
             **kwargs: Additional arguments for SimpleDirectoryReader and VectorStoreIndex
         """
         self.data_dir = data_dir
+        self.num_workers = num_workers
         self.index: Optional[VectorStoreIndex] = None
         self.reader_kwargs = {
             k: v
@@ -43,6 +60,20 @@ class LlamaIndexDB:
             k: v for k, v in kwargs.items() if k not in self.reader_kwargs
         }
 
+        if embed_batch_size is not None:
+            # resolve_embed_model can return the global Settings.embed_model, so
+            # adjust a copy to leave other llama_index users in the process alone
+            embed_model = resolve_embed_model(
+                self.index_kwargs.get("embed_model", Settings.embed_model)
+            )
+            self.index_kwargs["embed_model"] = embed_model.model_copy(
+                update={
+                    "embed_batch_size": max(
+                        embed_model.embed_batch_size, embed_batch_size
+                    )
+                }
+            )
+
         logger.info("Initialized LlamaIndexDB")
         data_path = Path(self.data_dir)
         if not data_path.exists():
@@ -52,7 +83,7 @@ class LlamaIndexDB:
         try:
             documents = SimpleDirectoryReader(
                 self.data_dir, **self.reader_kwargs
-            ).load_data()
+            ).load_data(num_workers=self.num_workers)
             self.index = VectorStoreIndex.from_documents(documents, **self.index_kwargs)
             logger.success(f"Successfully indexed documents from {self.data_dir}")
         except Exception as e:
@@ -83,7 +114,6 @@ class LlamaIndexDB:
         try:
             query_engine = self.index.as_query_engine(**kwargs)
             response = query_engine.query(query)
-            print(response)
             logger.info(f"Successfully queried: {query}")
             return str(response)
         except Exception as e:
@@ -91,17 +121,17 @@ class LlamaIndexDB:
             raise
 
 
-# # Example usage
-# llama_index_db = LlamaIndexDB(
-#     data_dir="docs",
-#     filename_as_id=True,
-#     recursive=True,
-#     required_exts=[".txt", ".pdf", ".docx"],
-#     similarity_top_k=3
-# )
-# response = llama_index_db.query(
-#     "What is the medical history of patient 1?",
-#     streaming=True,
-#     response_mode="compact"
-# )
-# print(response)
+if __name__ == "__main__":
+    # Example usage
+    llama_index_db = LlamaIndexDB(
+        data_dir="docs",
+        filename_as_id=True,
+        recursive=True,
+        required_exts=[".txt", ".pdf", ".docx"],
+        similarity_top_k=3,
+    )
+    response = llama_index_db.query(
+        "What is the medical history of patient 1?",
+        response_mode="compact",
+    )
+    print(response)
@@ -1,32 +1,110 @@
 import asyncio
-from typing import List, Dict, Optional, Union, Any
+import os
+import threading
+from typing import Iterator, List, Dict, Optional, Tuple, Union, Any
 from pathlib import Path
-import hashlib
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 
-import pinecone
+import aiofiles
+import blake3
+from pinecone import PodSpec
+from pinecone.grpc import PineconeGRPC
 from loguru import logger
 import tiktoken
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
+from multi_agent_rag.embeddings import get_embedder
+from multi_agent_rag.text_store import TextStore
+from multi_agent_rag.uring_reader import read_files_uring
+
+
+_BLAKE3_THREADING_MIN_BYTES = 1 << 20
+_MAX_TOKENS = 8191  # OpenAI's token limit
+
+
+@lru_cache(maxsize=None)
+def _get_tokenizer(encoding_name: str = "cl100k_base") -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop serving sync calls, starting it on first use."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="pinecone-manager-loop",
+                daemon=True,
+            ).start()
+    return _background_loop
+
 
 def sync_wrapper(async_func):
-    """Decorator to convert async functions to sync for external interface."""
+    """Decorator to convert async functions to sync for external interface.
+
+    Coroutines run on one persistent event loop in a background thread, so
+    sync calls neither create a loop per call nor depend on the loop state of
+    the calling thread.
+    """
 
     @wraps(async_func)
     def sync_func(*args, **kwargs):
+        loop = _get_background_loop()
         try:
-            loop = asyncio.get_event_loop()
+            running_loop = asyncio.get_running_loop()
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop.run_until_complete(async_func(*args, **kwargs))
+            running_loop = None
+        if running_loop is loop:
+            raise RuntimeError(
+                f"{async_func.__name__} cannot be called synchronously from "
+                "within the background loop, await its async version instead"
+            )
+
+        future = asyncio.run_coroutine_threadsafe(async_func(*args, **kwargs), loop)
+        return future.result()
 
     return sync_func
 
 
+def _chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive chunks of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _find_files(
+    folder_path: Path, file_extensions: List[str], recursive: bool
+) -> List[Path]:
+    """
+    Collect the files of a folder whose names end with one of the extensions.
+
+    Entries are filtered by name straight from os.scandir, so non-matching
+    files are skipped without any stat call.
+    """
+    extensions = tuple(frozenset(ext.lower() for ext in file_extensions))
+    file_paths = []
+    pending = [folder_path]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(Path(entry.path))
+                elif entry.name.lower().endswith(extensions) and entry.is_file():
+                    file_paths.append(Path(entry.path))
+
+    return sorted(file_paths)
+
+
 class PineconeManager:
     """
     A production-grade class for managing Pinecone vector database operations.
@@ -42,7 +120,10 @@ class PineconeManager:
         index_name (str): Name of the Pinecone index
         dimension (int): Dimension of the embedding vectors
         metric (str): Distance metric used for similarity search
+        client (PineconeGRPC): Pinecone client using the gRPC transport
         embedder (SentenceTransformer): Model for generating text embeddings
+        text_store (TextStore): Local store of the indexed texts, keyed by index,
+            namespace and vector ID
         batch_size (int): Size of batches for bulk operations
         namespace (str): Namespace in Pinecone index
     """
@@ -57,6 +138,9 @@ class PineconeManager:
         metric: str = "cosine",
         batch_size: int = 100,
         namespace: str = "",
+        device: Optional[str] = None,
+        quantize: bool = True,
+        text_store_path: str = "pinecone_texts.db",
     ) -> None:
         """
         Initialize the PineconeManager.
@@ -64,12 +148,15 @@ class PineconeManager:
         Args:
             api_key: Pinecone API key
             index_name: Name of the Pinecone index
-            environment: Pinecone environment
+            environment: Pinecone environment used when the index is created
             embedding_model: Name of the sentence-transformer model to use
             dimension: Dimension of the embedding vectors
             metric: Distance metric for similarity search
             batch_size: Size of batches for bulk operations
             namespace: Namespace in Pinecone index
+            device: Device for the embedding model, None to pick one automatically
+            quantize: Whether to quantize the embedding model to INT8 on CPU
+            text_store_path: SQLite file holding the indexed texts
 
         Raises:
             ValueError: If invalid parameters are provided
@@ -83,30 +170,61 @@ class PineconeManager:
         self.batch_size = batch_size
         self.namespace = namespace
 
-        # Initialize Pinecone
+        # Initialize Pinecone over gRPC, which keeps a persistent HTTP/2
+        # channel and avoids JSON encoding on every request
         try:
-            pinecone.init(api_key=api_key, environment=environment)
+            self.client = PineconeGRPC(api_key=api_key)
         except Exception as e:
             logger.error(f"Failed to initialize Pinecone: {str(e)}")
             raise ConnectionError(f"Could not connect to Pinecone: {str(e)}")
 
         # Create index if it doesn't exist
-        if index_name not in pinecone.list_indexes():
+        if index_name not in self.client.list_indexes().names():
             logger.info(f"Creating new index: {index_name}")
-            pinecone.create_index(name=index_name, dimension=dimension, metric=metric)
+            self.client.create_index(
+                name=index_name,
+                dimension=dimension,
+                metric=metric,
+                spec=PodSpec(environment=environment),
+            )
 
-        self.index = pinecone.Index(index_name)
+        self.index = self.client.Index(index_name)
 
         # Initialize embedding model
         try:
-            self.embedder = SentenceTransformer(embedding_model)
+            self.embedder = get_embedder(embedding_model, device, quantize)
             logger.info(f"Initialized embedding model: {embedding_model}")
         except Exception as e:
             logger.error(f"Failed to load embedding model: {str(e)}")
             raise ValueError(f"Could not load embedding model: {str(e)}")
 
+        # Texts live in a local store instead of the Pinecone metadata
+        self.text_store = TextStore(text_store_path, index_name, namespace)
+
         # Initialize tokenizer for length validation
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.tokenizer = _get_tokenizer("cl100k_base")
+
+    def _validate_text(self, text: str) -> None:
+        """
+        Check that input text can be embedded.
+
+        Args:
+            text: Input text to validate
+
+        Raises:
+            ValueError: If text is empty or too long
+        """
+        if not text.strip():
+            raise ValueError("Empty text provided")
+
+        # Each token covers at least one UTF-8 byte, so only texts longer than
+        # the limit in bytes need the full BPE pass
+        if len(text.encode("utf-8")) <= _MAX_TOKENS:
+            return
+
+        tokens = self.tokenizer.encode(text)
+        if len(tokens) > _MAX_TOKENS:
+            raise ValueError(f"Text too long: {len(tokens)} tokens (max {_MAX_TOKENS})")
 
     def _generate_embedding(self, text: str) -> np.ndarray:
         """
@@ -121,23 +239,180 @@ class PineconeManager:
         Raises:
             ValueError: If text is empty or too long
         """
-        if not text.strip():
-            raise ValueError("Empty text provided")
+        self._validate_text(text)
+        return self.embedder.encode(text)
 
-        tokens = self.tokenizer.encode(text)
-        if len(tokens) > 8191:  # OpenAI's token limit
-            raise ValueError(f"Text too long: {len(tokens)} tokens (max 8191)")
+    def _generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a batch of already validated texts in a single
+        model call.
 
-        return self.embedder.encode(text)
+        Args:
+            texts: Input texts to embed
+
+        Returns:
+            numpy.ndarray: Embedding matrix with one row per text
+        """
+        return self.embedder.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=self.metric == "cosine",
+        )
 
     def _generate_id(self, text: str) -> str:
         """Generate a deterministic ID for a piece of text."""
-        return hashlib.md5(text.encode()).hexdigest()
+        data = text.encode("utf-8")
+        # Multithreaded tree hashing only pays off on large inputs
+        max_threads = (
+            blake3.blake3.AUTO if len(data) >= _BLAKE3_THREADING_MIN_BYTES else 1
+        )
+        return blake3.blake3(data, max_threads=max_threads).hexdigest()[:32]
+
+    def _build_vectors(
+        self,
+        texts: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Optional[Dict[str, Any]]],
+    ) -> List[Tuple[str, List[float], Dict[str, Any]]]:
+        """Assemble (id, values, metadata) upsert tuples for embedded texts."""
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            (
+                self._generate_id(text),
+                embedding.tolist(),
+                {
+                    **(metadata or {}),
+                    "timestamp": timestamp,
+                    "char_count": len(text),
+                },
+            )
+            for text, embedding, metadata in zip(texts, embeddings, metadatas)
+        ]
 
-    @sync_wrapper
-    async def add(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    def _embed_vectors(
+        self,
+        texts: List[str],
+        metadatas: List[Optional[Dict[str, Any]]],
+        validate: bool = True,
+    ) -> List[Tuple[str, List[float], Dict[str, Any]]]:
         """
-        Add a single text item to the index.
+        Embed texts and assemble their upsert tuples.
+
+        Validation, the model call, ID hashing and the conversion of the
+        embeddings to lists all block, so callers run this whole method with a
+        single asyncio.to_thread.
+
+        Args:
+            texts: Texts to embed
+            metadatas: Metadata for each text
+            validate: Whether to validate the texts first, False for texts
+                that were already validated
+
+        Returns:
+            List of (id, values, metadata) tuples
+
+        Raises:
+            ValueError: If validate is set and any text is empty or too long
+        """
+        if validate:
+            for text in texts:
+                self._validate_text(text)
+
+        embeddings = self._generate_embeddings(texts)
+        return self._build_vectors(texts, embeddings, metadatas)
+
+    async def _upsert_vectors(
+        self,
+        texts: List[str],
+        vectors: List[Tuple[str, List[float], Dict[str, Any]]],
+    ) -> None:
+        """Upsert the vectors in batch_size chunks and store the texts locally.
+
+        The texts of a chunk are only stored once its upsert has succeeded, so
+        a failed upsert never leaves text rows behind for missing vectors.
+        """
+        for chunk, text_chunk in zip(
+            _chunked(vectors, self.batch_size), _chunked(texts, self.batch_size)
+        ):
+            await asyncio.to_thread(
+                self.index.upsert, vectors=chunk, namespace=self.namespace
+            )
+            await asyncio.to_thread(
+                self.text_store.put_many,
+                [
+                    (vector_id, text)
+                    for (vector_id, _, _), text in zip(chunk, text_chunk)
+                ],
+            )
+
+    async def _async_add_many(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        """
+        Internal async implementation of adding multiple text items.
+
+        All texts are embedded in one batched call and upserted in chunks of
+        batch_size vectors. The texts themselves are kept in the local text
+        store rather than in the vector metadata.
+
+        Args:
+            texts: Texts to add to the index
+            metadatas: Optional metadata for each text
+
+        Returns:
+            List[str]: IDs of the added items
+
+        Raises:
+            ValueError: If any text is invalid
+            ConnectionError: If Pinecone operation fails
+        """
+        if not texts:
+            return []
+
+        metadatas = metadatas or [None] * len(texts)
+        if len(metadatas) != len(texts):
+            raise ValueError("Number of metadatas must match number of texts")
+
+        try:
+            vectors = await asyncio.to_thread(self._embed_vectors, texts, metadatas)
+            await self._upsert_vectors(texts, vectors)
+
+            logger.info(f"Added {len(vectors)} texts to index")
+            return [vector_id for vector_id, _, _ in vectors]
+
+        except Exception as e:
+            logger.error(f"Failed to add texts to index: {str(e)}")
+            raise
+
+    def add_many(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        """
+        Synchronous method to add multiple text items to the index.
+
+        Args:
+            texts: Texts to add to the index
+            metadatas: Optional metadata for each text
+
+        Returns:
+            List[str]: IDs of the added items
+
+        Raises:
+            ValueError: If any text is invalid
+            ConnectionError: If Pinecone operation fails
+        """
+        return sync_wrapper(self._async_add_many)(texts, metadatas)
+
+    async def _async_add(
+        self, text: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Internal async implementation of adding a single text item.
 
         Args:
             text: Text to add to the index
@@ -150,30 +425,25 @@ class PineconeManager:
             ValueError: If text is invalid
             ConnectionError: If Pinecone operation fails
         """
-        try:
-            vector_id = self._generate_id(text)
-            embedding = self._generate_embedding(text)
+        vector_ids = await self._async_add_many([text], [metadata])
+        return vector_ids[0]
 
-            metadata = metadata or {}
-            metadata.update(
-                {
-                    "text": text,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "char_count": len(text),
-                }
-            )
+    def add(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Synchronous method to add a single text item to the index.
 
-            await self.index.upsert(
-                vectors=[(vector_id, embedding.tolist(), metadata)],
-                namespace=self.namespace,
-            )
+        Args:
+            text: Text to add to the index
+            metadata: Optional metadata to store with the vector
 
-            logger.info(f"Added text to index with ID: {vector_id}")
-            return vector_id
+        Returns:
+            str: ID of the added item
 
-        except Exception as e:
-            logger.error(f"Failed to add text to index: {str(e)}")
-            raise
+        Raises:
+            ValueError: If text is invalid
+            ConnectionError: If Pinecone operation fails
+        """
+        return sync_wrapper(self._async_add)(text, metadata)
 
     async def _async_query(
         self,
@@ -192,26 +462,42 @@ class PineconeManager:
             score_threshold: Minimum similarity score threshold
 
         Returns:
-            List of dictionaries containing matches and scores
+            List of dictionaries containing matches, scores and texts
         """
         try:
-            query_embedding = self._generate_embedding(query_text)
+            query_embedding = await asyncio.to_thread(
+                self._generate_embedding, query_text
+            )
 
-            results = await self.index.query(
+            results = await asyncio.to_thread(
+                self.index.query,
                 vector=query_embedding.tolist(),
                 top_k=top_k,
+                include_values=False,
                 include_metadata=include_metadata,
                 namespace=self.namespace,
             )
 
-            matches = []
-            for match in results.matches:
-                if score_threshold and match.score < score_threshold:
-                    continue
+            matches = [
+                match
+                for match in results.matches
+                if not (score_threshold and match.score < score_threshold)
+            ]
+            texts = await asyncio.to_thread(
+                self.text_store.get_many, [match.id for match in matches]
+            )
 
-                matches.append(
-                    {"id": match.id, "score": match.score, "metadata": match.metadata}
-                )
+            matches = [
+                {
+                    "id": match.id,
+                    "score": match.score,
+                    # Vectors written before texts moved to the text store
+                    # still carry their text in the metadata
+                    "text": texts.get(match.id) or (match.metadata or {}).get("text"),
+                    "metadata": match.metadata,
+                }
+                for match in matches
+            ]
 
             logger.info(f"Query returned {len(matches)} results")
             return matches
@@ -237,7 +523,7 @@ class PineconeManager:
             score_threshold: Minimum similarity score threshold
 
         Returns:
-            List of dictionaries containing matches and scores
+            List of dictionaries containing matches, scores and texts
 
         Raises:
             ValueError: If query is invalid
@@ -257,14 +543,29 @@ class PineconeManager:
         folder_path: Union[str, Path],
         file_extensions: List[str] = [".txt", ".md"],
         recursive: bool = True,
+        max_concurrency: int = 32,
+        use_uring: bool = False,
+        read_batch_size: int = 64,
+        uring_queue_depth: int = 4096,
     ) -> List[str]:
         """
         Add all compatible files from a folder to the index.
 
+        Files go through a three-stage pipeline connected by bounded queues:
+        batches are read from disk, embedded, and upserted, so one batch is
+        being encoded while the next is read and the previous one uploaded.
+
         Args:
             folder_path: Path to folder
             file_extensions: List of file extensions to process
             recursive: Whether to process subfolders
+            max_concurrency: Maximum number of files processed at once
+            use_uring: Read files with batched io_uring submissions instead,
+                for cold-cache ingestion of large folders on Linux
+            read_batch_size: Number of files read and embedded per batch
+            uring_queue_depth: Number of files read per io_uring call when
+                use_uring is set, split into read_batch_size batches for the
+                encoder
 
         Returns:
             List of added file IDs
@@ -277,32 +578,114 @@ class PineconeManager:
         if not folder_path.exists():
             raise FileNotFoundError(f"Folder not found: {folder_path}")
 
-        added_ids = []
-        pattern = "**/*" if recursive else "*"
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Token validation and stat() block, so _prepare_file only ever runs
+        # on worker threads
+        def _prepare_file(file_path: Path, text: str) -> Tuple[str, Dict[str, Any]]:
+            self._validate_text(text)
+            metadata = {
+                "filename": file_path.name,
+                "filepath": str(file_path),
+                "file_size": file_path.stat().st_size,
+            }
+            return text, metadata
+
+        async def _read_file(file_path: Path) -> Tuple[str, Dict[str, Any]]:
+            async with semaphore:
+                logger.info(f"Processing file: {file_path}")
 
-        try:
-            for file_path in folder_path.glob(pattern):
-                if file_path.suffix.lower() not in file_extensions:
-                    continue
+                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                    text = await f.read()
 
-                logger.info(f"Processing file: {file_path}")
+                return await asyncio.to_thread(_prepare_file, file_path, text)
 
+        def _read_files_uring(
+            file_paths: List[Path],
+        ) -> List[Union[Tuple[str, Dict[str, Any]], Exception]]:
+            contents = read_files_uring(file_paths, queue_depth=uring_queue_depth)
+
+            results = []
+            for file_path in file_paths:
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        text = f.read()
+                    if file_path not in contents:
+                        raise IOError("File could not be read")
+                    text = contents[file_path].decode("utf-8")
+                    results.append(_prepare_file(file_path, text))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        added_ids: List[str] = []
+
+        async def _reader(file_paths: List[Path]) -> None:
+            # A ring is set up per read call, so io_uring reads fill a whole
+            # queue before the files are split into encoder batches
+            read_size = uring_queue_depth if use_uring else read_batch_size
+            for read_paths in _chunked(file_paths, read_size):
+                if use_uring:
+                    results = await asyncio.to_thread(_read_files_uring, read_paths)
+                else:
+                    results = await asyncio.gather(
+                        *[_read_file(file_path) for file_path in read_paths],
+                        return_exceptions=True,
+                    )
+
+                prepared = []
+                for file_path, result in zip(read_paths, results):
+                    if isinstance(result, Exception):
+                        logger.error(
+                            f"Failed to process file {file_path}: {str(result)}"
+                        )
+                        continue
+                    prepared.append(result)
+
+                for batch in _chunked(prepared, read_batch_size):
+                    await read_queue.put(batch)
+            await read_queue.put(None)
+
+        async def _encoder() -> None:
+            while True:
+                batch = await read_queue.get()
+                if batch is None:
+                    break
+
+                texts = [text for text, _ in batch]
+                metadatas = [metadata for _, metadata in batch]
+                # Texts were validated by _prepare_file when they were read
+                vectors = await asyncio.to_thread(
+                    self._embed_vectors, texts, metadatas, validate=False
+                )
+                await upsert_queue.put((texts, vectors))
+            await upsert_queue.put(None)
 
-                    metadata = {
-                        "filename": file_path.name,
-                        "filepath": str(file_path),
-                        "file_size": file_path.stat().st_size,
-                    }
+        async def _uploader() -> None:
+            while True:
+                item = await upsert_queue.get()
+                if item is None:
+                    break
 
-                    vector_id = await self.add(text, metadata)
-                    added_ids.append(vector_id)
+                texts, vectors = item
+                await self._upsert_vectors(texts, vectors)
+                added_ids.extend(vector_id for vector_id, _, _ in vectors)
 
-                except Exception as e:
-                    logger.error(f"Failed to process file {file_path}: {str(e)}")
-                    continue
+        try:
+            file_paths = _find_files(folder_path, file_extensions, recursive)
+
+            stages = [
+                asyncio.create_task(_reader(file_paths)),
+                asyncio.create_task(_encoder()),
+                asyncio.create_task(_uploader()),
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except Exception:
+                # A failed stage would leave the others blocked on their queues
+                for stage in stages:
+                    stage.cancel()
+                raise
 
             logger.info(f"Added {len(added_ids)} files to index")
             return added_ids
@@ -323,7 +706,10 @@ class PineconeManager:
             ConnectionError: If Pinecone operation fails
         """
         try:
-            await self.index.delete(ids=vector_ids, namespace=self.namespace)
+            await asyncio.to_thread(
+                self.index.delete, ids=vector_ids, namespace=self.namespace
+            )
+            await asyncio.to_thread(self.text_store.delete_many, vector_ids)
             logger.info(f"Deleted {len(vector_ids)} vectors from index")
         except Exception as e:
             logger.error(f"Failed to delete vectors: {str(e)}")
@@ -336,7 +722,8 @@ class PineconeManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit with cleanup."""
         try:
-            pinecone.deinit()
+            self.index.close()
+            self.text_store.close()
             logger.info("Cleaned up Pinecone connection")
         except Exception as e:
             logger.error(f"Cleanup failed: {str(e)}")
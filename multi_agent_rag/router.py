@@ -0,0 +1,156 @@
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from swarms import AgentRearrange
+from swarms.structs.context_utils import agent_answer
+from swarms.structs.ma_blocks import find_agent_by_name
+
+
+class ParallelAgentRearrange(AgentRearrange):
+    """An AgentRearrange that bounds and times out its concurrent flow steps.
+
+    The flow, the shared conversation, ``output_type`` and the handling of
+    sequential steps are all AgentRearrange's own: every agent is given the
+    conversation so far, so a fan-in step sees the original task and the
+    answers of every earlier step, and only each agent's final answer is
+    recorded. Only the comma-separated steps (e.g. ``"A -> B, C -> D"``) are
+    changed: at most ``max_parallel_agents`` of their agents run at once, and
+    the step stops waiting for an agent after ``agent_timeout`` seconds.
+
+    A sync agent cannot be interrupted, so a timed-out agent keeps running on
+    its worker thread (and keeps updating its own memory) while the flow
+    moves on without its answer. Agents that failed or timed out are left out
+    of the conversation and their names are kept in ``failed_agents`` for the
+    last run. A step in which every agent fails raises a RuntimeError.
+
+    Args:
+        max_parallel_agents (int): Maximum number of agents running at once
+            within a concurrent step. Defaults to 4.
+        agent_timeout (Optional[float]): Seconds to wait for each agent of a
+            concurrent step, from when it starts. None waits indefinitely.
+            Defaults to None.
+        *args, **kwargs: Passed through to AgentRearrange.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_parallel_agents: int = 4,
+        agent_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if max_parallel_agents < 1:
+            raise ValueError("max_parallel_agents must be at least 1")
+        self.max_parallel_agents = max_parallel_agents
+        self.agent_timeout = agent_timeout
+        self.failed_agents: List[str] = []
+
+    def _run(self, *args, **kwargs) -> Any:
+        """Run the flow, resetting the agents that failed in the last run."""
+        self.failed_agents = []
+        return super()._run(*args, **kwargs)
+
+    def _run_concurrent_workflow(
+        self,
+        agent_names: List[str],
+        img: str = None,
+        *args,
+        **kwargs,
+    ) -> Dict[str, str]:
+        """
+        Run the agents of a comma-separated step concurrently.
+
+        Args:
+            agent_names: Names of the agents of the step
+            img: Image input for agents that support it
+            **kwargs: Passed through to each agent's run
+
+        Returns:
+            Dict[str, str]: Final answer of each agent that succeeded
+
+        Raises:
+            RuntimeError: If every agent of the step fails
+        """
+        logger.info(f"Running agents in parallel: {agent_names}")
+        agents = [find_agent_by_name(self.agents, name) for name in agent_names]
+
+        # Messages are built before any answer of this step is recorded, so
+        # the agents of a step all see the same conversation
+        queued = deque(
+            (index, *self._messages_for(name)) for index, name in enumerate(agent_names)
+        )
+        results: List[Any] = [None] * len(agents)
+        running: Dict[Future, Tuple[int, Optional[float]]] = {}
+
+        # Sized for every agent so a worker is always free when an agent is
+        # started, and never joined so a timeout returns promptly
+        executor = ThreadPoolExecutor(
+            max_workers=len(agents), thread_name_prefix="parallel-agent"
+        )
+        try:
+            while queued or running:
+                while queued and len(running) < self.max_parallel_agents:
+                    index, prior, step_task = queued.popleft()
+                    future = executor.submit(
+                        agents[index].run,
+                        task=step_task,
+                        messages=prior,
+                        img=img,
+                        **kwargs,
+                    )
+                    deadline = (
+                        time.monotonic() + self.agent_timeout
+                        if self.agent_timeout is not None
+                        else None
+                    )
+                    running[future] = (index, deadline)
+
+                deadlines = [d for _, d in running.values() if d is not None]
+                done, _ = wait(
+                    running,
+                    timeout=(
+                        max(0.0, min(deadlines) - time.monotonic())
+                        if deadlines
+                        else None
+                    ),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    index, _ = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        results[index] = e
+
+                # A timed-out agent no longer counts towards max_parallel_agents
+                now = time.monotonic()
+                for future, (index, deadline) in list(running.items()):
+                    if deadline is not None and deadline <= now:
+                        del running[future]
+                        results[index] = TimeoutError(
+                            f"No answer after {self.agent_timeout} seconds"
+                        )
+        finally:
+            executor.shutdown(wait=False)
+
+        response_dict: Dict[str, str] = {}
+        for agent, agent_name, result in zip(agents, agent_names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Agent {agent_name} failed: {result!r}")
+                self.failed_agents.append(agent_name)
+                continue
+
+            # run() returns the agent's whole conversation by default, record the answer
+            answer = agent_answer(agent, fallback=result)
+            self.conversation.add(agent_name, answer)
+            response_dict[agent_name] = answer
+
+        if not response_dict:
+            raise RuntimeError(f"All agents failed in flow step: {agent_names}")
+
+        return response_dict
@@ -0,0 +1,271 @@
+import atexit
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+import orjson
+from loguru import logger
+from sentence_transformers import SentenceTransformer
+
+from multi_agent_rag.embeddings import get_embedder
+
+
+class SemanticCache:
+    """
+    An in-memory cache of answers keyed by the meaning of the query.
+
+    Queries are embedded with a sentence-transformer and L2-normalized, so the
+    inner product search of the FAISS index is a cosine similarity lookup. The
+    index is an HNSW graph, which keeps lookups sub-millisecond as the cache
+    grows. A cached answer is returned when the closest stored query is at
+    least ``similarity_threshold`` similar and has not outlived its TTL.
+
+    Every entry is stored under an exact key, such as a patient identifier,
+    and the HNSW search of a lookup is restricted to the live entries with the
+    same key through an ID selector. Tasks that differ only in who they are
+    about embed almost identically, so without the key one patient's answer
+    could be served for another.
+
+    Expired entries are skipped by lookups and only dropped once they make up
+    half of the index, since an HNSW graph can be rebuilt but not pruned. The
+    cache is written to ``index_path`` by ``save``, which also runs at exit.
+
+    Attributes:
+        embedder (SentenceTransformer): Model for generating query embeddings
+        similarity_threshold (float): Minimum cosine similarity for a hit
+        ttl (Optional[float]): Lifetime of an entry in seconds, None for no expiry
+        index_path (Optional[Path]): File the index is persisted to
+        index (faiss.IndexHNSWFlat): Inner product HNSW index over cached queries
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        similarity_threshold: float = 0.92,
+        ttl: Optional[float] = 3600,
+        index_path: Optional[str] = None,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+    ) -> None:
+        """
+        Initialize the SemanticCache.
+
+        Args:
+            embedding_model: Name of the sentence-transformer model to use
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            ttl: Lifetime of a cache entry in seconds, None to never expire
+            index_path: File to persist the cache to and reload it from at
+                startup, None to keep the cache in memory only
+            hnsw_m: Number of neighbors per node in the HNSW graph
+            ef_search: Size of the candidate list explored per lookup
+        """
+        self.embedder: SentenceTransformer = get_embedder(embedding_model)
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.index_path = Path(index_path) if index_path else None
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+
+        self.dimension = self.embedder.get_sentence_embedding_dimension()
+        self.index = self._new_index()
+        self.answers: List[Any] = []
+        self.keys: List[str] = []
+        self.expires_at: List[float] = []
+        self._ids_by_key: Dict[str, List[int]] = {}
+
+        if self.index_path:
+            if self.index_path.exists():
+                self._load()
+            atexit.register(self.save)
+
+        logger.info(f"Initialized SemanticCache with model: {embedding_model}")
+
+    @property
+    def _entries_path(self) -> Path:
+        """File holding the answers and expiry times next to the index."""
+        return self.index_path.with_name(self.index_path.name + ".json")
+
+    def _new_index(self) -> faiss.IndexHNSWFlat:
+        """Create an empty inner product HNSW index."""
+        index = faiss.IndexHNSWFlat(
+            self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efSearch = self.ef_search
+        return index
+
+    def _index_keys(self) -> None:
+        """Rebuild the mapping from each key to the IDs of its entries."""
+        self._ids_by_key = {}
+        for i, key in enumerate(self.keys):
+            self._ids_by_key.setdefault(key, []).append(i)
+
+    def _load(self) -> None:
+        """Reload the index and its entries from index_path."""
+        entries = orjson.loads(self._entries_path.read_bytes())
+        if "keys" not in entries:
+            logger.warning(f"Ignoring unkeyed cache entries in {self.index_path}")
+            return
+
+        self.index = faiss.read_index(str(self.index_path))
+        self.index.hnsw.efSearch = self.ef_search
+        self.answers = entries["answers"]
+        self.keys = entries["keys"]
+        self.expires_at = [
+            float("inf") if expiry is None else expiry
+            for expiry in entries["expires_at"]
+        ]
+        self._index_keys()
+        logger.info(f"Loaded {len(self.answers)} cache entries from {self.index_path}")
+
+    def save(self) -> None:
+        """Persist the index and its entries to index_path."""
+        if not self.index_path:
+            return
+
+        faiss.write_index(self.index, str(self.index_path))
+        self._entries_path.write_bytes(
+            orjson.dumps(
+                {
+                    "answers": self.answers,
+                    "keys": self.keys,
+                    # JSON has no infinity, entries that never expire are null
+                    "expires_at": [
+                        None if expiry == float("inf") else expiry
+                        for expiry in self.expires_at
+                    ],
+                },
+                default=str,
+            )
+        )
+
+    def _embed(self, query: str) -> np.ndarray:
+        """Embed a query as a normalized float32 row vector."""
+        return self.embedder.encode(
+            [query], convert_to_numpy=True, normalize_embeddings=True
+        ).astype(np.float32)
+
+    def _evict_expired(self) -> None:
+        """Rebuild the index without the entries whose TTL has passed."""
+        now = time.time()
+        keep = [i for i, expiry in enumerate(self.expires_at) if expiry > now]
+
+        # HNSW graphs do not support removal, so rebuild from the kept vectors
+        embeddings = self.index.reconstruct_n(0, self.index.ntotal)[keep]
+        self.answers = [self.answers[i] for i in keep]
+        self.keys = [self.keys[i] for i in keep]
+        self.expires_at = [self.expires_at[i] for i in keep]
+        self._index_keys()
+
+        self.index = self._new_index()
+        if keep:
+            self.index.add(embeddings)
+        logger.info(f"Evicted expired entries, {len(keep)} remaining")
+
+    def get(self, query: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached answer for a query.
+
+        Args:
+            query: Query to look up
+            key: Exact key the answer must have been stored under
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        now = time.time()
+        ids = [i for i in self._ids_by_key.get(key, ()) if self.expires_at[i] > now]
+        if not ids:
+            return None
+
+        selector = faiss.IDSelectorBatch(np.array(ids, dtype=np.int64))
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+        scores, found = self.index.search(self._embed(query), 1, params=params)
+        score, idx = float(scores[0, 0]), int(found[0, 0])
+        if idx < 0 or score < self.similarity_threshold:
+            return None
+
+        logger.info(f"Semantic cache hit with similarity {score:.3f}")
+        return self.answers[idx]
+
+    def set(self, query: str, key: str, answer: Any) -> None:
+        """
+        Store the answer to a query.
+
+        Args:
+            query: Query the answer belongs to
+            key: Exact key to store the answer under
+            answer: Answer to cache
+        """
+        now = time.time()
+        if 2 * sum(expiry <= now for expiry in self.expires_at) > len(self.expires_at):
+            self._evict_expired()
+
+        self.index.add(self._embed(query))
+        self._ids_by_key.setdefault(key, []).append(len(self.answers))
+        self.answers.append(answer)
+        self.keys.append(key)
+        self.expires_at.append(now + self.ttl if self.ttl is not None else float("inf"))
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        self.index = self._new_index()
+        self.answers = []
+        self.keys = []
+        self.expires_at = []
+        self._ids_by_key = {}
+
+
+class CachedRouter:
+    """
+    Wraps a swarm router so near-duplicate tasks skip the whole agent flow.
+
+    Semantic hits need a ``cache_key`` naming who a task is about, such as
+    the patient identifier, passed to ``run``. Near-duplicate tasks only
+    share an answer under the same key; without a key each task is its own
+    key, so only verbatim repeats are served from the cache.
+
+    Args:
+        router: Any object exposing ``run(task)``, e.g. an AgentRearrange
+        cache (Optional[SemanticCache]): Cache to use. Defaults to a new
+            SemanticCache.
+    """
+
+    def __init__(self, router: Any, cache: Optional[SemanticCache] = None) -> None:
+        self.router = router
+        self.cache = cache or SemanticCache()
+
+    def run(self, task: str, *args, cache_key: Optional[str] = None, **kwargs) -> Any:
+        """
+        Return the cached answer for the task or run the router on a miss.
+
+        Only complete answers are cached: exceptions returned by the router
+        and results of runs in which an agent failed or timed out are passed
+        through without being stored.
+
+        Args:
+            task: Task to run
+            *args, **kwargs: Passed through to the router on a miss
+            cache_key: Exact key scoping the cache lookup, e.g. the patient
+                identifier. Required for near-duplicate hits; without one, a
+                task only matches itself verbatim.
+
+        Returns:
+            The router output for the task
+        """
+        key = task if cache_key is None else cache_key
+
+        answer = self.cache.get(task, key)
+        if answer is not None:
+            return answer
+
+        answer = self.router.run(task, *args, **kwargs)
+
+        failed_agents = getattr(self.router, "failed_agents", None)
+        if answer is None or isinstance(answer, BaseException) or failed_agents:
+            logger.warning("Not caching incomplete router output")
+            return answer
+
+        self.cache.set(task, key, answer)
+        return answer
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from loguru import logger
+
+# Stay below SQLite's default limit on host parameters per statement
+_MAX_PARAMS = 900
+
+
+class TextStore:
+    """
+    A local SQLite key-value store for document text, keyed by vector ID.
+
+    Rows are scoped to one Pinecone index and namespace, so several managers
+    can share a database file without the same vector ID in different
+    namespaces overwriting each other's text.
+
+    Keeping the text next to the application instead of in the vector
+    database metadata keeps index storage and query payloads small; the text
+    for a page of matches is fetched afterwards with a single local lookup.
+
+    Args:
+        path (Union[str, Path]): SQLite database file. Defaults to "texts.db".
+        index_name (str): Index the stored vectors belong to. Defaults to "".
+        namespace (str): Namespace the stored vectors belong to. Defaults to "".
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "texts.db",
+        index_name: str = "",
+        namespace: str = "",
+    ) -> None:
+        self.path = Path(path)
+        self.index_name = index_name
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts (index_name TEXT NOT NULL, "
+                "namespace TEXT NOT NULL, id TEXT NOT NULL, text TEXT NOT NULL, "
+                "PRIMARY KEY (index_name, namespace, id))"
+            )
+
+        logger.info(f"Initialized TextStore at {self.path}")
+
+    def put_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Store (id, text) pairs, replacing existing texts with the same ID."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO texts (index_name, namespace, id, text) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (self.index_name, self.namespace, vector_id, text)
+                    for vector_id, text in items
+                ),
+            )
+
+    def get_many(self, ids: List[str]) -> Dict[str, str]:
+        """Fetch the texts stored for the given IDs, skipping unknown IDs."""
+        texts: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(ids), _MAX_PARAMS):
+                chunk = ids[start : start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT id, text FROM texts WHERE index_name = ? AND namespace = ? "
+                    f"AND id IN ({placeholders})",
+                    (self.index_name, self.namespace, *chunk),
+                )
+                texts.update(rows)
+        return texts
+
+    def delete_many(self, ids: List[str]) -> None:
+        """Remove the texts stored for the given IDs."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM texts WHERE index_name = ? AND namespace = ? AND id = ?",
+                [(self.index_name, self.namespace, i) for i in ids],
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
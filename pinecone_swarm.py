@@ -1,5 +1,4 @@
 import os
-from swarms import AgentRearrange
 from multi_agent_rag.agents import (
     diagnostic_specialist,
     medical_data_extractor,
@@ -8,11 +7,15 @@ from multi_agent_rag.agents import (
     treatment_planner,
 )
 from multi_agent_rag.pinecone_wrapper import PineconeManager
+from multi_agent_rag.router import ParallelAgentRearrange
+from multi_agent_rag.semantic_cache import CachedRouter, SemanticCache
 
-router = AgentRearrange(
+router = ParallelAgentRearrange(
     name="medical-diagnosis-treatment-swarm",
     description="Collaborative medical team for comprehensive patient diagnosis and treatment planning",
     max_loops=1,
+    max_parallel_agents=2,
+    agent_timeout=300,
     agents=[
         medical_data_extractor,
         diagnostic_specialist,
@@ -25,10 +28,15 @@ router = AgentRearrange(
         index_name=os.getenv("PINECONE_INDEX_NAME"),
         environment=os.getenv("PINECONE_ENVIRONMENT"),
     ),
-    flow=f"{medical_data_extractor.agent_name} -> {diagnostic_specialist.agent_name} -> {treatment_planner.agent_name} -> {specialist_consultant.agent_name} -> {patient_care_coordinator.agent_name}",
+    flow=f"{medical_data_extractor.agent_name} -> {diagnostic_specialist.agent_name} -> {treatment_planner.agent_name}, {specialist_consultant.agent_name} -> {patient_care_coordinator.agent_name}",
+)
+
+cached_router = CachedRouter(
+    router, cache=SemanticCache(index_path="semantic_cache.faiss")
 )
 
 if __name__ == "__main__":
-    router.run(
-        "Analyze this Lucas Brown's medical data to provide a diagnosis and treatment plan"
+    cached_router.run(
+        "Analyze this Lucas Brown's medical data to provide a diagnosis and treatment plan",
+        cache_key="Lucas Brown",
     )
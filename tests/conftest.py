@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# swarms writes logs and agent state under WORKSPACE_DIR, keep them out of the repo
+os.environ.setdefault("WORKSPACE_DIR", tempfile.mkdtemp(prefix="agent_workspace_"))
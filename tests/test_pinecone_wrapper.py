@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from multi_agent_rag.pinecone_wrapper import _find_files, sync_wrapper
+
+
+@sync_wrapper
+async def current_thread_name():
+    return threading.current_thread().name
+
+
+@sync_wrapper
+async def fail():
+    raise ValueError("boom")
+
+
+@sync_wrapper
+async def call_sync_from_loop():
+    return current_thread_name()
+
+
+def test_sync_wrapper_runs_on_the_background_loop():
+    assert current_thread_name() == "pinecone-manager-loop"
+
+
+def test_sync_wrapper_from_worker_threads():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        names = list(executor.map(lambda _: current_thread_name(), range(8)))
+
+    assert set(names) == {"pinecone-manager-loop"}
+
+
+def test_sync_wrapper_from_inside_another_event_loop():
+    async def caller():
+        return current_thread_name()
+
+    assert asyncio.run(caller()) == "pinecone-manager-loop"
+
+
+def test_sync_wrapper_propagates_exceptions():
+    with pytest.raises(ValueError, match="boom"):
+        fail()
+
+
+def test_sync_wrapper_refuses_calls_from_the_background_loop():
+    with pytest.raises(RuntimeError, match="cannot be called synchronously"):
+        call_sync_from_loop()
+
+
+@pytest.fixture
+def folder(tmp_path):
+    (tmp_path / "notes.txt").write_text("notes")
+    (tmp_path / "README.MD").write_text("readme")
+    (tmp_path / "image.png").write_bytes(b"png")
+    (tmp_path / "dir.txt").mkdir()
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "nested.Txt").write_text("nested")
+    return tmp_path
+
+
+def names(paths, root):
+    return [str(path.relative_to(root)) for path in paths]
+
+
+def test_find_files_matches_extensions_case_insensitively(folder):
+    found = _find_files(folder, [".TXT", ".md"], recursive=True)
+
+    assert names(found, folder) == ["README.MD", "notes.txt", "sub/nested.Txt"]
+
+
+def test_find_files_without_recursion(folder):
+    found = _find_files(folder, [".txt"], recursive=False)
+
+    assert names(found, folder) == ["notes.txt"]
+
+
+def test_find_files_skips_symlinked_directories_but_keeps_symlinked_files(folder):
+    (folder / "sub" / "loop").symlink_to(folder, target_is_directory=True)
+    (folder / "link.txt").symlink_to(folder / "notes.txt")
+
+    found = _find_files(folder, [".txt"], recursive=True)
+
+    assert names(found, folder) == ["link.txt", "notes.txt", "sub/nested.Txt"]
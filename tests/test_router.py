@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from multi_agent_rag.router import ParallelAgentRearrange
+
+
+class FakeAgent:
+    """Agent double whose run() returns a whole transcript, like Agent.run."""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.agent_name = name
+        self.delay = delay
+        self.error = error
+        self.messages = None
+        self.task = None
+        self.short_memory = self
+        self._answer = None
+
+    def get_final_message_content(self):
+        return self._answer
+
+    def run(self, task=None, messages=None, img=None, **kwargs):
+        self.messages, self.task = messages, task
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self._answer = f"{self.agent_name} answer"
+        return f"system prompt and history ... {self._answer}"
+
+
+def make_router(agents, flow, **kwargs):
+    return ParallelAgentRearrange(
+        agents=agents, flow=flow, output_type="final", autosave=False, **kwargs
+    )
+
+
+def seen_by(agent):
+    return [message["content"] for message in agent.messages] + [agent.task]
+
+
+def test_fan_in_step_sees_task_and_all_earlier_answers():
+    a, b, c, d = FakeAgent("A"), FakeAgent("B"), FakeAgent("C"), FakeAgent("D")
+    router = make_router([a, b, c, d], "A -> B, C -> D")
+
+    assert router.run("patient task") == "D answer"
+
+    seen = "\n".join(seen_by(d))
+    assert "patient task" in seen
+    for name in "ABC":
+        assert f"{name}: {name} answer" in seen
+    assert "system prompt and history" not in seen
+
+
+def test_timeout_returns_promptly_and_drops_the_slow_agent():
+    a, slow, fast, d = FakeAgent("A"), FakeAgent("B", 3), FakeAgent("C"), FakeAgent("D")
+    router = make_router([a, slow, fast, d], "A -> B, C -> D", agent_timeout=0.2)
+
+    start = time.monotonic()
+    router.run("patient task")
+
+    assert time.monotonic() - start < 1
+    assert router.failed_agents == ["B"]
+    seen = "\n".join(seen_by(d))
+    assert "C: C answer" in seen
+    assert "B answer" not in seen
+
+
+def test_failed_agent_is_isolated():
+    agents = [FakeAgent("A", error=ValueError("boom")), FakeAgent("B"), FakeAgent("C")]
+    router = make_router(agents, "A, B -> C")
+
+    assert router.run("patient task") == "C answer"
+    assert router.failed_agents == ["A"]
+
+
+def test_step_where_every_agent_fails_raises():
+    agents = [
+        FakeAgent("A", error=ValueError("boom")),
+        FakeAgent("B", error=ValueError("boom")),
+        FakeAgent("C"),
+    ]
+    router = make_router(agents, "A, B -> C")
+
+    with pytest.raises(RuntimeError):
+        router.run("patient task")
+
+
+def test_max_parallel_agents_caps_concurrency():
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    class CountingAgent(FakeAgent):
+        def run(self, *args, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            try:
+                return super().run(*args, **kwargs)
+            finally:
+                with lock:
+                    running -= 1
+
+    agents = [CountingAgent(name, 0.1) for name in "ABCD"] + [FakeAgent("E")]
+    router = make_router(agents, "A, B, C, D -> E", max_parallel_agents=2)
+
+    router.run("patient task")
+
+    assert peak == 2
@@ -0,0 +1,117 @@
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+from multi_agent_rag import semantic_cache
+from multi_agent_rag.semantic_cache import CachedRouter, SemanticCache
+
+TASK = "analyze the medical data and provide a diagnosis and treatment plan"
+
+
+class BagOfWordsEmbedder:
+    """Embedder double: tasks sharing most of their words embed close together."""
+
+    def get_sentence_embedding_dimension(self):
+        return 64
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        embeddings = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                embeddings[row, zlib.crc32(word.encode()) % 64] += 1
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+
+
+@pytest.fixture(autouse=True)
+def fake_embedder(monkeypatch):
+    monkeypatch.setattr(
+        semantic_cache, "get_embedder", lambda *args, **kwargs: BagOfWordsEmbedder()
+    )
+
+
+def test_near_duplicate_hits_only_under_the_same_key():
+    cache = SemanticCache(similarity_threshold=0.9)
+    cache.set(TASK, "alice", "alice answer")
+
+    assert cache.get(TASK + " please", "alice") == "alice answer"
+    assert cache.get(TASK + " please", "bob") is None
+    assert cache.get("something else entirely", "alice") is None
+
+
+def test_expired_entries_miss_and_are_evicted():
+    cache = SemanticCache(ttl=0.05)
+    cache.set(TASK, "alice", "old answer")
+    time.sleep(0.1)
+
+    assert cache.get(TASK, "alice") is None
+
+    cache.set(TASK, "bob", "new answer")
+    assert cache.index.ntotal == 1
+    assert cache.get(TASK, "bob") == "new answer"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index_path = tmp_path / "cache.faiss"
+    cache = SemanticCache(ttl=None, index_path=str(index_path))
+    cache.set(TASK, "alice", "alice answer")
+    cache.set(TASK, "bob", "bob answer")
+    cache.save()
+
+    reloaded = SemanticCache(ttl=None, index_path=str(index_path))
+
+    assert reloaded.get(TASK, "alice") == "alice answer"
+    assert reloaded.get(TASK, "bob") == "bob answer"
+
+
+class FakeRouter:
+    def __init__(self, answer, failed_agents=()):
+        self.answer = answer
+        self.failed_agents = list(failed_agents)
+        self.calls = 0
+
+    def run(self, task, *args, **kwargs):
+        self.calls += 1
+        return self.answer
+
+
+def test_cached_router_reuses_answers_within_a_key():
+    router = FakeRouter("diagnosis")
+    cached = CachedRouter(router)
+
+    cached.run(TASK, cache_key="alice")
+    cached.run(TASK + " please", cache_key="alice")
+    cached.run(TASK, cache_key="bob")
+
+    assert router.calls == 2
+
+
+def test_cached_router_without_key_only_hits_verbatim_repeats():
+    router = FakeRouter("diagnosis")
+    cached = CachedRouter(router)
+
+    cached.run(TASK)
+    cached.run(TASK)
+    cached.run(TASK + " please")
+
+    assert router.calls == 2
+
+
+@pytest.mark.parametrize(
+    "router",
+    [
+        FakeRouter(None),
+        FakeRouter(RuntimeError("agent failed")),
+        FakeRouter("partial answer", failed_agents=["Diagnostic-Specialist"]),
+    ],
+)
+def test_cached_router_does_not_cache_incomplete_answers(router):
+    cached = CachedRouter(router)
+
+    cached.run(TASK, cache_key="alice")
+    cached.run(TASK, cache_key="alice")
+
+    assert router.calls == 2
@@ -0,0 +1,44 @@
+import pytest
+
+from multi_agent_rag.text_store import _MAX_PARAMS, TextStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "texts.db"
+
+
+def test_namespaces_do_not_share_texts(db_path):
+    first = TextStore(db_path, "index", "first")
+    second = TextStore(db_path, "index", "second")
+    other_index = TextStore(db_path, "other", "first")
+
+    first.put_many([("id", "first text")])
+    second.put_many([("id", "second text")])
+
+    assert first.get_many(["id"]) == {"id": "first text"}
+    assert second.get_many(["id"]) == {"id": "second text"}
+    assert other_index.get_many(["id"]) == {}
+
+    second.delete_many(["id"])
+
+    assert first.get_many(["id"]) == {"id": "first text"}
+    assert second.get_many(["id"]) == {}
+
+
+def test_put_many_replaces_existing_text(db_path):
+    store = TextStore(db_path)
+    store.put_many([("id", "old")])
+    store.put_many([("id", "new")])
+
+    assert store.get_many(["id"]) == {"id": "new"}
+
+
+def test_get_many_chunks_large_id_lists(db_path):
+    store = TextStore(db_path)
+    items = [(f"id-{i}", f"text {i}") for i in range(2 * _MAX_PARAMS + 1)]
+    store.put_many(items)
+
+    texts = store.get_many([vector_id for vector_id, _ in items] + ["missing"])
+
+    assert texts == dict(items)